@@ -1,70 +1,17 @@
 import streamlit as st
-import pandas as pd
-import os
 import plotly.express as px
+from data import load_data, load_derived, apply_filters, make_pivot
 
 st.set_page_config(layout="wide") # 넓은 레이아웃 사용
 st.title("경제활동 데이터 뷰어")
 
-# --- 데이터 로딩 및 전처리 (캐시 사용) ---
-@st.cache_data
-def load_data():
-    # 파일 경로 설정
-    current_dir = os.path.dirname(__file__)
-    csv_path = os.path.join(current_dir, '경제활동_통합.csv')
-
-    # 인코딩 시도
-    encodings = ['utf-8', 'euc-kr', 'cp949']
-    df = None
-    for encoding in encodings:
-        try:
-            df = pd.read_csv(csv_path, encoding=encoding)
-            break
-        except UnicodeDecodeError:
-            continue
-        except FileNotFoundError:
-            st.error(f"오류: '{csv_path}' 파일을 찾을 수 없습니다.")
-            return None
-
-    if df is None:
-        st.error("데이터 파일을 읽는데 실패했습니다. 인코딩(utf-8, euc-kr, cp949)을 확인해주세요.")
-        return None
-
-    # --- 데이터 전처리 ---
-    if '지역' in df.columns:
-        df['지역'] = df['지역'].replace('계', '전국')
-
-    if '년도' in df.columns:
-        df['년도'] = df['년도'].astype(int).astype(str) + '년'
-
-    try:
-        required_cols = ['경제활동인구 (천명)', '취업자 (천명)', '실업자 (천명)']
-        for col in required_cols:
-            if df[col].dtype == 'object':
-                df[col] = df[col].str.replace(',', '', regex=False)
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-        df.dropna(subset=required_cols, inplace=True)
-
-        df['취업률'] = df.apply(lambda row: (row['취업자 (천명)'] / row['경제활동인구 (천명)']) * 100 if row['경제활동인구 (천명)'] > 0 else 0, axis=1).round(2)
-        df['실업률'] = df.apply(lambda row: (row['실업자 (천명)'] / row['경제활동인구 (천명)']) * 100 if row['경제활동인구 (천명)'] > 0 else 0, axis=1).round(2)
-    except KeyError as e:
-        st.warning(f"경고: {e} 컬럼이 없어 취업/실업률을 계산할 수 없습니다.")
-    except Exception as e:
-        st.warning(f"경고: 취업/실업률 계산 중 오류 발생: {e}")
-
-    return df
-
-df_original = load_data()
-
-if df_original is None:
-    st.stop()
+df_original = load_data() # 파일을 읽지 못하면 load_data 안에서 실행을 중단함
+
+region_options, unique_years, nationwide_df_sorted, has_chart_cols, default_pivots = load_derived()
 
 # 지역 필터
+select_all_regions = False
 if '지역' in df_original.columns:
-    unique_regions = sorted(df_original['지역'].unique())
-    # '전국'을 필터 옵션에서 제외
-    region_options = [r for r in unique_regions if r != '전국']
-
     # "전 지역" 체크박스 추가
     select_all_regions = st.sidebar.checkbox('전 지역', value=True)
 
@@ -82,37 +29,27 @@ else:
     st.sidebar.warning("'지역' 컬럼을 찾을 수 없습니다.")
 
 if '년도' in df_original.columns:
-    unique_years = sorted(df_original['년도'].unique(), reverse=True)
     year_options = ['전체'] + unique_years
-    selected_year_option = st.sidebar.selectbox('년도 선택', options=year_options, index=0)
+    selected_year_option = st.sidebar.selectbox(
+        '년도 선택',
+        options=year_options,
+        index=0,
+        format_func=lambda y: y if y == '전체' else f"{y}년"
+    )
 else:
     selected_year_option = '전체'
     st.sidebar.warning("'년도' 컬럼을 찾을 수 없습니다.")
 
 # --- 데이터 필터링 ---
-df_filtered = df_original.copy()
-
-if selected_regions:
-    df_filtered = df_filtered[df_filtered['지역'].isin(selected_regions)]
-
-if selected_year_option != '전체':
-    df_filtered = df_filtered[df_filtered['년도'] == selected_year_option]
+df_filtered = apply_filters(df_original, selected_regions, selected_year_option, all_regions=select_all_regions)
 
 # --- 데이터 표시 ---
-if '년도' in df_filtered.columns and '지역' in df_filtered.columns:
-    cols = df_filtered.columns.tolist()
-    if '년도' in cols: cols.remove('년도')
-    if '지역' in cols: cols.remove('지역')
-    new_order = ['년도', '지역'] + cols
-    df_filtered = df_filtered[new_order]
-
-st.write("#### 검색된 경제활동 데이터", df_filtered)
+st.write("#### 검색된 경제활동 데이터")
+st.dataframe(df_filtered, column_config={'년도': st.column_config.NumberColumn(format="%d년")})
 
 # --- 전국 데이터 요약 표시 ---
 st.write("---")
-nationwide_df = df_original[df_original['지역'] == '전국']
-if not nationwide_df.empty and all(c in nationwide_df.columns for c in ['년도', '취업률', '실업률']):
-    nationwide_df_sorted = nationwide_df.set_index('년도').sort_index()
+if nationwide_df_sorted is not None and not nationwide_df_sorted.empty:
     num_years = len(nationwide_df_sorted.index.unique())
     st.write(f"#### 최근 {num_years}년간 전국의 취업률과 실업률")
 
@@ -134,16 +71,19 @@ st.write("---")
 if selected_year_option == '전체':
     chart_title_prefix = "연도별"
 else:
-    chart_title_prefix = selected_year_option
+    chart_title_prefix = f"{selected_year_option}년"
 
 st.write(f"#### {chart_title_prefix} 지역별 비교")
 
-chart_cols = ['년도', '지역', '취업률', '실업률']
-if all(col in df_filtered.columns for col in chart_cols):
+if has_chart_cols:
     if not df_filtered.empty:
+        # 기본 화면(전 지역, 전체 년도)은 미리 만들어 둔 피벗을 사용
+        is_default_view = select_all_regions and selected_year_option == '전체'
+        pivot_key = (tuple(sorted(selected_regions)), selected_year_option)
+
         # 취업률 차트 (첫 번째 행)
         try:
-            employment_pivot = df_filtered.pivot_table(index='지역', columns='년도', values='취업률')
+            employment_pivot = default_pivots['취업률'] if is_default_view else make_pivot(df_filtered, '취업률', *pivot_key)
             fig_emp = px.bar(employment_pivot, barmode='group', text_auto='.2f', title=f"{chart_title_prefix} 지역별 취업률")
             fig_emp.update_traces(textposition='outside')
             st.plotly_chart(fig_emp, use_container_width=True)
@@ -152,7 +92,7 @@ if all(col in df_filtered.columns for col in chart_cols):
 
         # 실업률 차트 (두 번째 행)
         try:
-            unemployment_pivot = df_filtered.pivot_table(index='지역', columns='년도', values='실업률')
+            unemployment_pivot = default_pivots['실업률'] if is_default_view else make_pivot(df_filtered, '실업률', *pivot_key)
             fig_unemp = px.bar(unemployment_pivot, barmode='group', text_auto='.2f', title=f"{chart_title_prefix} 지역별 실업률")
             fig_unemp.update_traces(textposition='outside')
             st.plotly_chart(fig_unemp, use_container_width=True)
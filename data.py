@@ -0,0 +1,210 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import os
+import codecs
+import charset_normalizer
+
+# --- 데이터 로딩 및 전처리 (캐시 사용) ---
+def normalize_encoding(encoding):
+    # 'utf_8'과 'utf-8'처럼 표기만 다른 이름을 같은 이름으로 맞춤
+    try:
+        return codecs.lookup(encoding).name
+    except LookupError:
+        return None
+
+def read_cached_encoding(csv_path):
+    # 이전에 읽기에 성공한 인코딩이 CSV보다 최신일 때만 재사용
+    encoding_path = csv_path + '.encoding'
+    if not os.path.exists(encoding_path) or os.path.getmtime(encoding_path) < os.path.getmtime(csv_path):
+        return None
+    with open(encoding_path, encoding='utf-8') as f:
+        return normalize_encoding(f.read().strip())
+
+def write_cached_encoding(csv_path, encoding):
+    try:
+        with open(csv_path + '.encoding', 'w', encoding='utf-8') as f:
+            f.write(encoding)
+    except OSError:
+        pass # 저장에 실패해도 로딩은 계속 진행
+
+def detect_encoding(csv_path, sample_size=65536):
+    # 파일 앞부분만 읽어 인코딩 추정
+    with open(csv_path, 'rb') as f:
+        sample = f.read(sample_size)
+    best = charset_normalizer.from_bytes(sample).best()
+    if best is None:
+        return None
+    return normalize_encoding(best.encoding)
+
+def candidate_encodings(csv_path):
+    # 저장된 인코딩 -> 기본 인코딩 목록 -> 추정한 인코딩 순으로 시도
+    # 추정이 틀려도 오류 없이 디코딩되면 데이터가 깨지므로 추정값은 마지막에만 사용
+    cached_encoding = read_cached_encoding(csv_path)
+    if cached_encoding:
+        yield cached_encoding
+
+    tried = {cached_encoding}
+    for encoding in ['utf-8', 'euc-kr', 'cp949']:
+        encoding = normalize_encoding(encoding)
+        if encoding not in tried:
+            tried.add(encoding)
+            yield encoding
+
+    detected_encoding = detect_encoding(csv_path)
+    if detected_encoding and detected_encoding not in tried:
+        yield detected_encoding
+
+@st.cache_data(persist="disk", show_spinner=False, max_entries=1) # 인자가 없어 캐시 키가 고정됨
+def load_data():
+    # 파일 경로 설정
+    current_dir = os.path.dirname(__file__)
+    csv_path = os.path.join(current_dir, '경제활동_통합.csv')
+    parquet_path = os.path.join(current_dir, '경제활동_통합.parquet')
+
+    # 전처리 결과(parquet)가 CSV와 전처리 코드(이 파일)보다 최신이면 그대로 사용
+    if (os.path.exists(parquet_path) and os.path.exists(csv_path)
+            and os.path.getmtime(parquet_path) >= max(os.path.getmtime(csv_path), os.path.getmtime(__file__))):
+        try:
+            return pd.read_parquet(parquet_path, engine='pyarrow')
+        except Exception:
+            pass # 읽기에 실패하면 CSV에서 다시 전처리
+
+    if not os.path.exists(csv_path):
+        st.error(f"오류: '{csv_path}' 파일을 찾을 수 없습니다.")
+        st.stop() # None을 반환하면 실패 결과가 디스크 캐시에 저장됨
+
+    # 인코딩 시도 (성공한 인코딩은 다음 실행을 위해 저장)
+    df = None
+    for encoding in candidate_encodings(csv_path):
+        try:
+            # 천 단위 쉼표와 지역 카테고리를 읽는 시점에 처리해 최종 타입으로 바로 파싱
+            df = pd.read_csv(csv_path, encoding=encoding, thousands=',', dtype={'지역': 'category'})
+        except UnicodeDecodeError:
+            continue
+        except FileNotFoundError:
+            st.error(f"오류: '{csv_path}' 파일을 찾을 수 없습니다.")
+            st.stop()
+        write_cached_encoding(csv_path, encoding)
+        break
+
+    if df is None:
+        st.error("데이터 파일을 읽는데 실패했습니다. 인코딩(utf-8, euc-kr, cp949)을 확인해주세요.")
+        st.stop()
+
+    # --- 데이터 전처리 ---
+    if '지역' in df.columns:
+        # 카테고리 이름만 바꾸면 되므로 행 단위 치환이 필요 없음 (이름을 바꾼 뒤 가나다순으로 다시 정렬)
+        df['지역'] = df['지역'].cat.rename_categories({'계': '전국'})
+        df['지역'] = df['지역'].cat.reorder_categories(sorted(df['지역'].cat.categories))
+
+    if '년도' in df.columns:
+        # 정수로 유지하고 'YYYY년' 형식은 화면에 표시할 때만 적용
+        df['년도'] = df['년도'].astype('int16')
+
+    required_cols = ['경제활동인구 (천명)', '취업자 (천명)', '실업자 (천명)']
+    missing = [c for c in required_cols if c not in df.columns]
+    if missing:
+        st.warning(f"경고: {', '.join(missing)} 컬럼이 없어 취업/실업률을 계산할 수 없습니다.")
+    else:
+        for col in required_cols:
+            # read_csv가 이미 숫자형으로 읽은 컬럼은 변환을 건너뜀
+            # '-' 같은 값이 섞이면 컬럼 전체가 문자열로 남아 쉼표도 그대로이므로 쉼표를 지운 뒤 변환
+            if not pd.api.types.is_numeric_dtype(df[col]):
+                df[col] = pd.to_numeric(df[col].str.replace(',', '', regex=False), errors='coerce')
+        df.dropna(subset=required_cols, inplace=True)
+
+        # 행 단위 apply 대신 벡터 연산으로 비율 계산 (경제활동인구가 0이면 0)
+        econ = df['경제활동인구 (천명)'].to_numpy(dtype=float)
+        emp = df['취업자 (천명)'].to_numpy(dtype=float)
+        unemp = df['실업자 (천명)'].to_numpy(dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            df['취업률'] = np.where(econ > 0, emp / econ * 100, 0).round(2)
+            df['실업률'] = np.where(econ > 0, unemp / econ * 100, 0).round(2)
+
+        # 값 범위가 작으므로 더 작은 타입으로 줄여 메모리 사용량을 절반 이하로
+        for col in required_cols:
+            df[col] = pd.to_numeric(df[col], downcast='integer') # 소수가 섞여 있으면 그대로 유지
+        df['취업률'] = df['취업률'].astype('float32')
+        df['실업률'] = df['실업률'].astype('float32')
+
+    # 화면 표시용 컬럼 순서 ('년도', '지역' 먼저)는 로딩 시 한 번만 정리
+    if '년도' in df.columns and '지역' in df.columns:
+        cols = [c for c in df.columns if c not in ('년도', '지역')]
+        df = df[['년도', '지역', *cols]]
+
+    # 전처리가 끝까지 성공한 경우에만 parquet으로 저장
+    if '취업률' in df.columns and '실업률' in df.columns:
+        try:
+            df.to_parquet(parquet_path, engine='pyarrow', compression='snappy')
+        except Exception:
+            pass # 저장에 실패해도 로딩은 계속 진행
+
+    return df
+
+def build_pivot(df, value_col):
+    try:
+        # (지역, 년도) 쌍이 유일하므로 집계 없이 모양만 바꿈
+        pivot = df.pivot(index='지역', columns='년도', values=value_col)
+    except ValueError:
+        # 중복된 (지역, 년도) 쌍이 있으면 평균으로 집계
+        pivot = df.pivot_table(index='지역', columns='년도', values=value_col, observed=True)
+    # pivot은 파일 순서대로 행을 반환하므로 지역 이름순으로 정렬 (카테고리 코드 순서에 의존하지 않음)
+    pivot = pivot.sort_index(key=lambda i: i.astype(str))
+    pivot.columns = pd.Index([f"{c}년" for c in pivot.columns], name='년도') # 범례 제목 유지
+    return pivot
+
+@st.cache_data(show_spinner=False)
+def load_derived():
+    # 재실행마다 다시 계산할 필요가 없는 사이드바 옵션, 전국 요약 데이터, 기본 화면 피벗
+    df = load_data()
+
+    region_options = []
+    if '지역' in df.columns:
+        # '전국'을 필터 옵션에서 제외 (고유값 배열에 마스크 적용)
+        regions = np.asarray(df['지역'].unique(), dtype=object)
+        region_options = sorted(regions[regions != '전국'].tolist())
+
+    unique_years = []
+    if '년도' in df.columns:
+        unique_years = sorted(df['년도'].unique().tolist(), reverse=True)
+
+    # 차트에 필요한 컬럼 존재 여부 (로딩 후에는 컬럼이 바뀌지 않으므로 한 번만 확인)
+    has_chart_cols = {'년도', '지역', '취업률', '실업률'}.issubset(df.columns)
+
+    nationwide_df_sorted = None
+    default_pivots = None
+    if has_chart_cols:
+        # 기본 화면(전 지역, 전체 년도)의 피벗은 필터와 무관하므로 미리 만들어 둠
+        df_regions = apply_filters(df, region_options, '전체', all_regions=True)
+        default_pivots = {col: build_pivot(df_regions, col) for col in ['취업률', '실업률']}
+
+        # 요약 차트에 쓰는 컬럼만 남김 (캐시 결과는 재실행마다 복사본으로 반환되므로 작을수록 좋음)
+        nationwide_df_sorted = df.loc[df['지역'] == '전국', ['년도', '취업률', '실업률']].set_index('년도').sort_index()
+        nationwide_df_sorted.index = pd.Index([f"{y}년" for y in nationwide_df_sorted.index], name='년도') # x축 제목 유지
+
+    return region_options, unique_years, nationwide_df_sorted, has_chart_cols, default_pivots
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def make_pivot(_df_filtered, value_col, regions_key, year_key):
+    # _df_filtered는 해싱하지 않음: 필터링 결과는 (지역, 년도) 선택으로만 결정되므로 이를 캐시 키로 사용
+    return build_pivot(_df_filtered, value_col)
+
+# --- 데이터 필터링 ---
+def apply_filters(df, selected_regions, selected_year, all_regions=False):
+    # 필터링은 새 DataFrame을 반환하므로 원본을 복사할 필요가 없음
+    df_filtered = df
+
+    if all_regions:
+        # 전 지역 선택 시에는 '전국'만 제외하면 되므로 지역 목록과 비교할 필요가 없음
+        df_filtered = df_filtered[df_filtered['지역'] != '전국']
+    elif selected_regions:
+        # 문자열 비교 대신 카테고리 코드(정수)로 비교
+        selected_codes = df_filtered['지역'].cat.categories.get_indexer(selected_regions)
+        mask = np.isin(df_filtered['지역'].cat.codes.to_numpy(), selected_codes)
+        df_filtered = df_filtered[mask]
+
+    if selected_year != '전체':
+        df_filtered = df_filtered[df_filtered['년도'] == selected_year]
+
+    return df_filtered